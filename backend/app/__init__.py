@@ -1,6 +1,7 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_pymongo import PyMongo
+from flask_caching import Cache
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
@@ -17,6 +18,59 @@ mongo = PyMongo()  # MongoDB connection
 jwt = JWTManager()
 migrate = Migrate()
 login_manager = LoginManager()
+cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})
+
+# Preflight response headers, built once at import time
+_PREFLIGHT_HEADERS = [
+    ('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS'),
+    ('Access-Control-Max-Age', '600'),
+    ('Vary', 'Origin'),
+    ('Content-Length', '0'),
+]
+
+class _PreflightShortCircuit:
+    """Answer CORS preflights at the WSGI layer.
+
+    OPTIONS requests carrying Access-Control-Request-Method never enter
+    Flask's dispatch (session loading, before_request handlers, routing),
+    so preflights become nearly free. Actual requests still go through
+    Flask-CORS for header patching.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if (environ.get('REQUEST_METHOD') == 'OPTIONS'
+                and 'HTTP_ORIGIN' in environ
+                and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in environ):
+            headers = [
+                ('Access-Control-Allow-Origin', environ['HTTP_ORIGIN']),
+                ('Access-Control-Allow-Headers',
+                 environ.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS', '*')),
+            ]
+            headers.extend(_PREFLIGHT_HEADERS)
+            start_response('204 NO CONTENT', headers)
+            return [b'']
+        return self.wsgi_app(environ, start_response)
+
+def _ensure_mongo_indexes():
+    """Create MongoDB indexes matching the wearable service's query shapes.
+
+    Compound indexes on (user_id, date) let the aggregation range queries
+    walk the index instead of scanning, and (user_id, generated_at desc)
+    serves the latest-aggregate sort directly. Safe to call repeatedly;
+    create_index is a no-op when the index already exists.
+    """
+    mongo.db.wearable_connections.create_index("user_id", unique=True)
+    mongo.db.daily_activities.create_index([("user_id", 1), ("date", 1)])
+    mongo.db.sleep_data.create_index([("user_id", 1), ("date", 1)])
+    mongo.db.aggregated_wearable_data.create_index(
+        [("user_id", 1), ("generated_at", -1)]
+    )
+    mongo.db.aggregated_wearable_data.create_index(
+        [("user_id", 1), ("date_range.start", 1), ("date_range.end", 1)]
+    )
 
 def create_app(config_name='default'):
     app = Flask(__name__, 
@@ -36,18 +90,33 @@ def create_app(config_name='default'):
     jwt.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    cache.init_app(app)
     CORS(app)
-    
+    app.wsgi_app = _PreflightShortCircuit(app.wsgi_app)
+
     # Configure login
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
 
-    # User loader for Flask-Login
-    from .models.user import User
+    # User lookup memoized briefly so hot authenticated endpoints skip the
+    # by-primary-key roundtrip; 30s is short enough that stale reads are
+    # harmless for a model this simple.
+    @cache.memoize(timeout=30)
+    def _fetch_user(user_id):
+        # Imported here so app construction doesn't pull in the model layer
+        from .models.user import User
+        return User.query.get(user_id)
+
+    # User loader for Flask-Login. Cache hits come back as unpickled,
+    # detached instances; merge them into the session (load=False skips
+    # the re-fetch) so writes through current_user are still tracked.
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
-    
+        user = _fetch_user(int(user_id))
+        if user is not None:
+            user = db.session.merge(user, load=False)
+        return user
+
     # Register blueprints
     from .routes.auth import auth_bp
     from .routes.dashboard import dashboard_bp
@@ -55,16 +124,27 @@ def create_app(config_name='default'):
     from .routes.wearable import wearable_bp
     from .routes.user import user_bp
     from .routes.main import main_bp
-    
+
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(meal_plan_bp, url_prefix='/api/meal-plans')
     app.register_blueprint(wearable_bp, url_prefix='/api/wearables')
     app.register_blueprint(user_bp, url_prefix='/api/users')
     app.register_blueprint(main_bp)
-    
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-    
+
+    # MongoDB indexes are created with `flask ensure-indexes`, run once
+    # per deploy alongside `flask db upgrade`
+    @app.cli.command('ensure-indexes')
+    def ensure_indexes_command():
+        """Create the MongoDB indexes used by the wearable service."""
+        _ensure_mongo_indexes()
+
+    # Create database tables in dev/testing only; production schema is
+    # managed with Flask-Migrate (flask db upgrade) so workers don't issue
+    # reflection queries or race on DDL at boot
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            from .models.user import User  # noqa: F401
+            db.create_all()
+
     return app
\ No newline at end of file
@@ -17,6 +17,18 @@ class Config:
     # PostgreSQL configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = f"postgresql://{os.getenv('POSTGRES_USER')}:{quote_plus(os.getenv('POSTGRES_PASSWORD'))}@{os.getenv('POSTGRES_HOST')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}"
+
+    # Connection pool tuning. LIFO checkout keeps a small set of warm
+    # connections busy so idle ones can be recycled sooner; pre-ping costs
+    # one roundtrip per checkout but avoids handing out stale sockets.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DATABASE_POOL_SIZE', '20')),
+        'max_overflow': int(os.getenv('DATABASE_MAX_OVERFLOW', '30')),
+        'pool_timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DATABASE_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': True,
+        'pool_use_lifo': True,
+    }
     
     # MongoDB configuration
     MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/nutrisist')
@@ -24,10 +36,12 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = Config.SQLALCHEMY_DATABASE_URI
+    AUTO_CREATE_TABLES = True
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = Config.SQLALCHEMY_DATABASE_URI
+    AUTO_CREATE_TABLES = True
     MONGO_URI = os.getenv('TEST_MONGO_URI', 'mongodb://localhost:27017/nutrisist_test')
 
 class ProductionConfig(Config):
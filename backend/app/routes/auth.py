@@ -39,8 +39,12 @@ def register():
         first_name = request.form.get('first_name')
         last_name = request.form.get('last_name')
         
-        user = User.query.filter_by(email=email).first()
-        if user:
+        # EXISTS check instead of .first() — no row hydration just to test
+        # whether the email is taken
+        email_taken = db.session.query(
+            User.query.filter_by(email=email).exists()
+        ).scalar()
+        if email_taken:
             flash('Email already registered')
             return redirect(url_for('auth.register'))
         
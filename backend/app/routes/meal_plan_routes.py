@@ -3,12 +3,25 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.meal_service import MealService
 from flask_login import login_required, current_user
 from app.models import db, User, MealPlan, ActivityData
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from bisect import bisect_right
 import requests
 import json
 
 meal_plan_bp = Blueprint('meal_plan', __name__)
 
+# Placeholder recipe content shared across generated meals; module-level
+# tuples so each request reuses one immutable object instead of
+# allocating fresh lists per meal
+_PLACEHOLDER_INGREDIENTS = ('Ingredient 1', 'Ingredient 2', 'Ingredient 3')
+_PLACEHOLDER_INSTRUCTIONS = 'Sample cooking instructions'
+
+# Step thresholds and the activity multiplier for each bracket
+# (sedentary, lightly active, moderately active, very active); bisect
+# gives the bracket with one lookup instead of a branch chain
+_STEP_THRESHOLDS = (5000, 10000, 15000)
+_ACTIVITY_MULTIPLIERS = (1.0, 1.2, 1.4, 1.6)
+
 @meal_plan_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_meal_plans():
@@ -115,7 +128,7 @@ def generate_meal_plan():
             meal_frequency=meal_frequency,
             dietary_restrictions=json.dumps(dietary_restrictions),
             meals=json.dumps(meal_plan_data['meals']),
-            generated_at=datetime.utcnow()
+            generated_at=datetime.now(timezone.utc)
         )
         db.session.add(new_meal_plan)
         db.session.commit()
@@ -132,7 +145,7 @@ def generate_meal_plan():
         }), 200
 
     except Exception as e:
-        current_app.logger.error(f'Error generating meal plan: {str(e)}')
+        current_app.logger.error('Error generating meal plan: %s', e)
         return jsonify({'error': 'Failed to generate meal plan'}), 500
 
 @meal_plan_bp.route('/api/meal-plans/current', methods=['GET'])
@@ -157,14 +170,14 @@ def get_current_meal_plan():
         }), 200
 
     except Exception as e:
-        current_app.logger.error(f'Error fetching meal plan: {str(e)}')
+        current_app.logger.error('Error fetching meal plan: %s', e)
         return jsonify({'error': 'Failed to fetch meal plan'}), 500
 
 def get_user_activity_data():
     """Get user's recent activity data"""
     try:
         # Get activity data for the past week
-        end_date = datetime.utcnow().date()
+        end_date = datetime.now(timezone.utc).date()
         start_date = end_date - timedelta(days=6)
 
         activities = ActivityData.query.filter(
@@ -176,19 +189,21 @@ def get_user_activity_data():
         if not activities:
             return None
 
-        # Calculate average daily activity
-        total_steps = sum(activity.steps for activity in activities)
-        total_calories = sum(activity.calories for activity in activities)
-        avg_steps = total_steps / len(activities)
-        avg_calories = total_calories / len(activities)
+        # Calculate average daily activity in one pass over the rows
+        total_steps = 0
+        total_calories = 0
+        for activity in activities:
+            total_steps += activity.steps
+            total_calories += activity.calories
+        days = len(activities)
 
         return {
-            'avg_steps': avg_steps,
-            'avg_calories': avg_calories
+            'avg_steps': total_steps / days,
+            'avg_calories': total_calories / days
         }
 
     except Exception as e:
-        current_app.logger.error(f'Error getting activity data: {str(e)}')
+        current_app.logger.error('Error getting activity data: %s', e)
         return None
 
 def calculate_adjusted_calories(base_calories, activity_data):
@@ -196,21 +211,14 @@ def calculate_adjusted_calories(base_calories, activity_data):
     try:
         # Calculate activity multiplier based on steps
         steps = activity_data['avg_steps']
-        if steps < 5000:
-            multiplier = 1.0  # Sedentary
-        elif steps < 10000:
-            multiplier = 1.2  # Lightly active
-        elif steps < 15000:
-            multiplier = 1.4  # Moderately active
-        else:
-            multiplier = 1.6  # Very active
+        multiplier = _ACTIVITY_MULTIPLIERS[bisect_right(_STEP_THRESHOLDS, steps)]
 
         # Adjust calories
         adjusted_calories = base_calories * multiplier
         return round(adjusted_calories)
 
     except Exception as e:
-        current_app.logger.error(f'Error calculating adjusted calories: {str(e)}')
+        current_app.logger.error('Error calculating adjusted calories: %s', e)
         return base_calories
 
 def generate_ai_meal_plan(calories, dietary_restrictions, meal_frequency):
@@ -219,14 +227,15 @@ def generate_ai_meal_plan(calories, dietary_restrictions, meal_frequency):
         # TODO: Implement actual AI service integration
         # This is a placeholder implementation
         meals = []
-        calories_per_meal = calories / meal_frequency
+        # Per-meal calories don't vary by meal, so round once outside the loop
+        calories_per_meal = round(calories / meal_frequency)
 
         for i in range(meal_frequency):
             meal = {
                 'name': f'Meal {i+1}',
-                'calories': round(calories_per_meal),
-                'ingredients': ['Ingredient 1', 'Ingredient 2', 'Ingredient 3'],
-                'instructions': 'Sample cooking instructions',
+                'calories': calories_per_meal,
+                'ingredients': _PLACEHOLDER_INGREDIENTS,
+                'instructions': _PLACEHOLDER_INSTRUCTIONS,
                 'dietary_tags': dietary_restrictions
             }
             meals.append(meal)
@@ -237,5 +246,5 @@ def generate_ai_meal_plan(calories, dietary_restrictions, meal_frequency):
         }
 
     except Exception as e:
-        current_app.logger.error(f'Error generating AI meal plan: {str(e)}')
+        current_app.logger.error('Error generating AI meal plan: %s', e)
         return None
\ No newline at end of file
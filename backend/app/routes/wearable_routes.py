@@ -1,5 +1,5 @@
 # routes/wearable_routes.py
-from flask import Blueprint, request, jsonify, current_app, session
+from flask import Blueprint, request, jsonify, current_app, session, g
 from services.wearable_service import WearableService
 from services.meal_plan_generator import MealPlanGenerator
 from models.user import User
@@ -7,12 +7,44 @@ from pymongo import MongoClient
 from extensions import db
 from flask_login import login_required, current_user
 from app.models import WearableDevice, ActivityData
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import requests
 import json
 
 wearable_bp = Blueprint('wearable', __name__)
 
+# Shared HTTP session so TLS handshakes to wearable APIs are amortized
+# across requests instead of paid per call
+_HTTP = requests.Session()
+_HTTP.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=16, pool_maxsize=32))
+
+# (connect, read) timeouts so a slow provider can't pin a worker
+_HTTP_TIMEOUT = (3, 10)
+
+# Shared MongoClient, created lazily on first use. MongoClient is
+# thread-safe and keeps its own connection pool, so constructing one per
+# request threw that pool away every time.
+_mongo_client = None
+
+def _get_mongo_client():
+    global _mongo_client
+    if _mongo_client is None:
+        _mongo_client = MongoClient(current_app.config['MONGO_URI'])
+    return _mongo_client
+
+def _get_user_device():
+    """Current user's connected device, cached on flask.g for the request.
+
+    Several routes need the same (user_id) row; caching it per request
+    avoids issuing the identical SELECT more than once.
+    """
+    if 'wearable_device' not in g:
+        g.wearable_device = WearableDevice.query.filter_by(
+            user_id=current_user.id
+        ).first()
+    return g.wearable_device
+
 @wearable_bp.route('/connect', methods=['POST'])
 def connect_device():
     """Connect a wearable device"""
@@ -29,7 +61,6 @@ def connect_device():
         return jsonify({'error': 'Missing device_type or auth_token'}), 400
     
     # Initialize services
-    mongo_client = MongoClient(current_app.config['MONGO_URI'])
     wearable_service = WearableService(current_app.config['MONGO_URI'], 'nutrisist')
     
     # Connect device
@@ -49,8 +80,7 @@ def generate_plan_from_wearable():
     user_id = session['user_id']
     
     # Initialize services
-    mongo_client = MongoClient(current_app.config['MONGO_URI'])
-    meal_plan_generator = MealPlanGenerator(db.session, mongo_client.nutrisist)
+    meal_plan_generator = MealPlanGenerator(db.session, _get_mongo_client().nutrisist)
     
     # Generate plan
     result = meal_plan_generator.generate_from_wearable(user_id)
@@ -75,7 +105,7 @@ def connect_wearable():
             return jsonify({'error': 'Missing required fields'}), 400
 
         # Check if user already has a connected device
-        existing_device = WearableDevice.query.filter_by(user_id=current_user.id).first()
+        existing_device = _get_user_device()
         if existing_device:
             return jsonify({'error': 'User already has a connected device'}), 400
 
@@ -84,31 +114,31 @@ def connect_wearable():
             user_id=current_user.id,
             device_type=device_type,
             auth_token=auth_token,
-            connected_at=datetime.utcnow()
+            connected_at=datetime.now(timezone.utc)
         )
         db.session.add(new_device)
-        db.session.commit()
 
-        # Update user's wearable_connected status
+        # Update user's wearable_connected status in the same transaction
+        # so the connect costs one commit (and one fsync) instead of two
         current_user.wearable_connected = True
         db.session.commit()
 
         return jsonify({'message': 'Device connected successfully'}), 200
 
     except Exception as e:
-        current_app.logger.error(f'Error connecting wearable: {str(e)}')
+        current_app.logger.error('Error connecting wearable: %s', e)
         return jsonify({'error': 'Failed to connect device'}), 500
 
 @wearable_bp.route('/api/wearables/activity/today', methods=['GET'])
 @login_required
 def get_today_activity():
     try:
-        device = WearableDevice.query.filter_by(user_id=current_user.id).first()
+        device = _get_user_device()
         if not device:
             return jsonify({'error': 'No connected device found'}), 404
 
         # Fetch today's activity data
-        today = datetime.utcnow().date()
+        today = datetime.now(timezone.utc).date()
         activity = ActivityData.query.filter_by(
             user_id=current_user.id,
             date=today
@@ -139,19 +169,19 @@ def get_today_activity():
         }), 200
 
     except Exception as e:
-        current_app.logger.error(f'Error fetching activity data: {str(e)}')
+        current_app.logger.error('Error fetching activity data: %s', e)
         return jsonify({'error': 'Failed to fetch activity data'}), 500
 
 @wearable_bp.route('/api/wearables/activity/weekly', methods=['GET'])
 @login_required
 def get_weekly_activity():
     try:
-        device = WearableDevice.query.filter_by(user_id=current_user.id).first()
+        device = _get_user_device()
         if not device:
             return jsonify({'error': 'No connected device found'}), 404
 
         # Calculate date range for the past week
-        end_date = datetime.utcnow().date()
+        end_date = datetime.now(timezone.utc).date()
         start_date = end_date - timedelta(days=6)
 
         # Fetch weekly activity data
@@ -178,37 +208,55 @@ def get_weekly_activity():
         }), 200
 
     except Exception as e:
-        current_app.logger.error(f'Error fetching weekly activity: {str(e)}')
+        current_app.logger.error('Error fetching weekly activity: %s', e)
         return jsonify({'error': 'Failed to fetch weekly activity data'}), 500
 
+def _fetch_fitbit_activity(device):
+    """Fetch today's activity summary from the Fitbit API"""
+    headers = {
+        'Authorization': f'Bearer {device.auth_token}',
+        'Accept': 'application/json'
+    }
+    response = _HTTP.get(
+        'https://api.fitbit.com/1/user/-/activities/date/today.json',
+        headers=headers,
+        timeout=_HTTP_TIMEOUT
+    )
+    if response.status_code == 200:
+        # Bind the summary sub-dict once instead of re-walking
+        # data['summary'] (and rebuilding a default dict) per field
+        summary = response.json()['summary']
+        return {
+            'steps': summary['steps'],
+            'calories': summary['caloriesOut'],
+            'sleep_minutes': summary.get('totalMinutesAsleep', 0),
+            'heart_rate': summary.get('restingHeartRate', 0)
+        }
+    return None
+
+def _fetch_apple_health_activity(device):
+    # Implement Apple Health API integration
+    # Note: Apple Health requires different authentication and data access
+    return None
+
+# Dispatch table for supported device types; a dict lookup replaces the
+# if/elif chain and doubles as the single source of supported platforms
+_ACTIVITY_FETCHERS = {
+    'fitbit': _fetch_fitbit_activity,
+    'apple_health': _fetch_apple_health_activity,
+}
+
 def fetch_wearable_activity(device):
     """Fetch activity data from wearable device API"""
     try:
-        if device.device_type == 'fitbit':
-            # Implement Fitbit API integration
-            headers = {
-                'Authorization': f'Bearer {device.auth_token}',
-                'Accept': 'application/json'
-            }
-            response = requests.get(
-                'https://api.fitbit.com/1/user/-/activities/date/today.json',
-                headers=headers
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'steps': data['summary']['steps'],
-                    'calories': data['summary']['caloriesOut'],
-                    'sleep_minutes': data.get('summary', {}).get('totalMinutesAsleep', 0),
-                    'heart_rate': data.get('summary', {}).get('restingHeartRate', 0)
-                }
-        elif device.device_type == 'apple_health':
-            # Implement Apple Health API integration
-            # Note: Apple Health requires different authentication and data access
-            pass
-
-        return None
+        fetcher = _ACTIVITY_FETCHERS.get(device.device_type)
+        if fetcher is None:
+            return None
+        return fetcher(device)
 
-    except Exception as e:
-        current_app.logger.error(f'Error fetching from wearable API: {str(e)}')
+    # Only trap what the fetch can actually raise (network failures and
+    # unexpected payload shapes); anything else should surface rather
+    # than be swallowed as a missing reading
+    except (requests.RequestException, KeyError, ValueError) as e:
+        current_app.logger.error('Error fetching from wearable API: %s', e)
         return None
\ No newline at end of file
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 from flask import current_app
 from sqlalchemy import func
@@ -7,7 +8,31 @@ from app.services.wearable_service import WearableService
 
 class MealService:
     """Service for generating and managing meal plans based on wearable data"""
-    
+
+    # Calorie distribution tables keyed by meals per day; built once as
+    # class constants so each plan generation shares the same mappings
+    # instead of reallocating the literals per call
+    _MEAL_DISTRIBUTIONS = {
+        3: {
+            "breakfast": {"calorie_percent": 0.25},
+            "lunch": {"calorie_percent": 0.35},
+            "dinner": {"calorie_percent": 0.4}
+        },
+        4: {
+            "breakfast": {"calorie_percent": 0.25},
+            "lunch": {"calorie_percent": 0.3},
+            "snack": {"calorie_percent": 0.15},
+            "dinner": {"calorie_percent": 0.3}
+        },
+        5: {
+            "breakfast": {"calorie_percent": 0.2},
+            "morning_snack": {"calorie_percent": 0.1},
+            "lunch": {"calorie_percent": 0.3},
+            "afternoon_snack": {"calorie_percent": 0.1},
+            "dinner": {"calorie_percent": 0.3}
+        },
+    }
+
     @staticmethod
     def generate_meal_plan(user_id, days=7, name=None):
         """
@@ -51,9 +76,12 @@ class MealService:
             
             # Use recommendations from wearable data or fall back to profile goals
             daily_calories = wearable_data.get("recommended_calories", user_profile.calorie_goal)
-            protein_target = wearable_data.get("recommended_macros", {}).get("protein", user_profile.protein_goal)
-            carbs_target = wearable_data.get("recommended_macros", {}).get("carbs", user_profile.carb_goal)
-            fat_target = wearable_data.get("recommended_macros", {}).get("fat", user_profile.fat_goal)
+            # Bind the macros sub-dict once rather than re-fetching it (and
+            # allocating a fresh default) for each macro
+            macros = wearable_data.get("recommended_macros", {})
+            protein_target = macros.get("protein", user_profile.protein_goal)
+            carbs_target = macros.get("carbs", user_profile.carb_goal)
+            fat_target = macros.get("fat", user_profile.fat_goal)
             
             # Create meal plan
             plan_name = name or f"Meal Plan {start_date.strftime('%Y-%m-%d')}"
@@ -85,50 +113,55 @@ class MealService:
             if user_profile.preferred_cuisines:
                 preferred_cuisines = user_profile.preferred_cuisines.split(',')
             
+            # The candidate pool depends only on the meal time, not the day,
+            # so resolve it once per meal time instead of re-querying inside
+            # the day loop (meals-per-day queries instead of days x meals)
+            candidates_by_meal_time = {}
+            for meal_time, meal_info in meal_distribution.items():
+                # Calculate target calories for this meal
+                target_calories = int(daily_calories * meal_info["calorie_percent"])
+
+                # Find suitable meals
+                meals_query = db.session.query(Meal).filter(
+                    Meal.calories.between(target_calories * 0.9, target_calories * 1.1),
+                    Meal.meal_type == meal_time
+                )
+
+                # Apply cuisine preferences if available
+                if preferred_cuisines:
+                    meals_query = meals_query.filter(Meal.cuisine.in_(preferred_cuisines))
+
+                # Apply dietary restrictions
+                if restrictions:
+                    # This is a simplified approach - in reality, you'd need a more complex query
+                    # to filter out meals that contain ingredients with restricted properties
+                    pass
+
+                # Get top matching meals ordered by highest rating
+                top_meals = meals_query.order_by(Meal.avg_rating.desc()).limit(10).all()
+
+                # If no meals found, relax calorie constraints
+                if not top_meals:
+                    top_meals = db.session.query(Meal).filter(
+                        Meal.calories.between(target_calories * 0.8, target_calories * 1.2),
+                        Meal.meal_type == meal_time
+                    ).order_by(Meal.avg_rating.desc()).limit(5).all()
+
+                candidates_by_meal_time[meal_time] = top_meals
+
             # Generate meals for each day
             for day in range(days):
                 day_of_week = (start_date + timedelta(days=day)).weekday()  # 0-6 (Monday-Sunday)
-                
+
                 # Generate meals for each meal time
-                for meal_time, meal_info in meal_distribution.items():
-                    # Calculate target calories for this meal
-                    target_calories = int(daily_calories * meal_info["calorie_percent"])
-                    
-                    # Find suitable meals
-                    meals_query = db.session.query(Meal).filter(
-                        Meal.calories.between(target_calories * 0.9, target_calories * 1.1),
-                        Meal.meal_type == meal_time
-                    )
-                    
-                    # Apply cuisine preferences if available
-                    if preferred_cuisines:
-                        meals_query = meals_query.filter(Meal.cuisine.in_(preferred_cuisines))
-                    
-                    # Apply dietary restrictions
-                    if restrictions:
-                        # This is a simplified approach - in reality, you'd need a more complex query
-                        # to filter out meals that contain ingredients with restricted properties
-                        pass
-                    
-                    # Get top matching meals ordered by highest rating
-                    top_meals = meals_query.order_by(Meal.avg_rating.desc()).limit(10).all()
-                    
-                    # If no meals found, relax calorie constraints
-                    if not top_meals:
-                        top_meals = db.session.query(Meal).filter(
-                            Meal.calories.between(target_calories * 0.8, target_calories * 1.2),
-                            Meal.meal_type == meal_time
-                        ).order_by(Meal.avg_rating.desc()).limit(5).all()
-                    
-                    # Select a meal (in a real app, you'd implement a more sophisticated algorithm)
-                    selected_meal = None
-                    if top_meals:
-                        selected_meal = top_meals[day % len(top_meals)]  # Simple rotation for variety
-                    
+                for meal_time, top_meals in candidates_by_meal_time.items():
                     # If no suitable meal found, skip
-                    if not selected_meal:
+                    if not top_meals:
                         continue
-                    
+
+                    # Select a meal (in a real app, you'd implement a more sophisticated algorithm)
+                    selected_meal = top_meals[day % len(top_meals)]  # Simple rotation for variety
+
                     # Add meal to plan
                     stmt = meal_plan_meals.insert().values(
                         meal_plan_id=new_plan.id,
@@ -144,7 +177,7 @@ class MealService:
             return new_plan
             
         except Exception as e:
-            current_app.logger.error(f"Error generating meal plan: {str(e)}")
+            current_app.logger.error("Error generating meal plan: %s", e)
             db.session.rollback()
             return None
     
@@ -160,34 +193,10 @@ class MealService:
         Returns:
             dict: Meal distribution with calorie percentages
         """
-        if meals_per_day == 3:
-            return {
-                "breakfast": {"calorie_percent": 0.25},
-                "lunch": {"calorie_percent": 0.35},
-                "dinner": {"calorie_percent": 0.4}
-            }
-        elif meals_per_day == 4:
-            return {
-                "breakfast": {"calorie_percent": 0.25},
-                "lunch": {"calorie_percent": 0.3},
-                "snack": {"calorie_percent": 0.15},
-                "dinner": {"calorie_percent": 0.3}
-            }
-        elif meals_per_day == 5:
-            return {
-                "breakfast": {"calorie_percent": 0.2},
-                "morning_snack": {"calorie_percent": 0.1},
-                "lunch": {"calorie_percent": 0.3},
-                "afternoon_snack": {"calorie_percent": 0.1},
-                "dinner": {"calorie_percent": 0.3}
-            }
-        else:
-            # Default to 3 meals
-            return {
-                "breakfast": {"calorie_percent": 0.25},
-                "lunch": {"calorie_percent": 0.35},
-                "dinner": {"calorie_percent": 0.4}
-            }
+        # Default to 3 meals for unsupported counts
+        return MealService._MEAL_DISTRIBUTIONS.get(
+            meals_per_day, MealService._MEAL_DISTRIBUTIONS[3]
+        )
     
     @staticmethod
     def get_meal_plan(meal_plan_id, user_id=None):
@@ -225,12 +234,10 @@ class MealService:
                 meal_plan_meals.c.meal_plan_id == meal_plan_id
             ).all()
             
-            # Structure by day and meal time
-            days = {}
+            # Structure by day and meal time; defaultdict drops the
+            # membership test and extra dict lookup per row
+            days = defaultdict(dict)
             for meal, meal_time, day_of_week in meal_data:
-                if day_of_week not in days:
-                    days[day_of_week] = {}
-                
                 days[day_of_week][meal_time] = {
                     "id": meal.id,
                     "name": meal.name,
@@ -263,7 +270,7 @@ class MealService:
             return result
             
         except Exception as e:
-            current_app.logger.error(f"Error getting meal plan: {str(e)}")
+            current_app.logger.error("Error getting meal plan: %s", e)
             return None
     
     @staticmethod
@@ -301,5 +308,5 @@ class MealService:
             return result
             
         except Exception as e:
-            current_app.logger.error(f"Error getting user meal plans: {str(e)}")
+            current_app.logger.error("Error getting user meal plans: %s", e)
             return []
\ No newline at end of file
@@ -1,11 +1,36 @@
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
 from flask import current_app
+from pymongo import UpdateOne
 from app import mongo, db
 from app.models.models import User, UserProfile
 
+# Activity-level multipliers for the Harris-Benedict adjustment; built once
+# at import instead of being reallocated on every aggregation
+_ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "lightly_active": 1.375,
+    "moderately_active": 1.55,
+    "very_active": 1.725,
+}
+
+# Average-step thresholds and the activity level for each bracket;
+# bisect_right picks the bracket with one lookup instead of a branch
+# chain (>= semantics: exactly 5000 steps is already lightly_active)
+_STEP_THRESHOLDS = (5000, 7500, 10000)
+_ACTIVITY_LEVELS = ("sedentary", "lightly_active", "moderately_active", "very_active")
+
+# Sleep-quality bands scanned best-first:
+# (min duration h, min deep sleep h, min efficiency %, label)
+_SLEEP_QUALITY_BANDS = (
+    (8, 1.5, 90, "excellent"),
+    (7, 1.2, 85, "good"),
+    (6, 1.0, 80, "fair"),
+)
+
 class WearableService:
     """Service for interacting with wearable data in MongoDB and handling device connections"""
-    
+
     @staticmethod
     def connect_device(user_id, device_type, auth_data):
         """
@@ -28,7 +53,7 @@ class WearableService:
             user_profile.wearable_connected = True
             user_profile.wearable_type = device_type
             user_profile.wearable_id = auth_data.get('device_id')
-            user_profile.last_sync = datetime.utcnow()
+            user_profile.last_sync = datetime.now(timezone.utc)
             
             db.session.commit()
             
@@ -37,9 +62,9 @@ class WearableService:
                 "user_id": str(user_id),
                 "device_type": device_type,
                 "device_id": auth_data.get('device_id'),
-                "last_sync": datetime.utcnow(),
+                "last_sync": datetime.now(timezone.utc),
                 "auth_token": auth_data.get('access_token'),
-                "auth_expires": datetime.utcnow() + timedelta(days=30),  # Assuming 30-day token
+                "auth_expires": datetime.now(timezone.utc) + timedelta(days=30),  # Assuming 30-day token
             }
             
             # Upsert the wearable connection data
@@ -55,7 +80,7 @@ class WearableService:
             return True
             
         except Exception as e:
-            current_app.logger.error(f"Error connecting device: {str(e)}")
+            current_app.logger.error("Error connecting device: %s", e)
             return False
     
     @staticmethod
@@ -80,10 +105,14 @@ class WearableService:
             # For this example, we'll simulate some data
             
             # Get the last 7 days of data
-            end_date = datetime.utcnow()
+            end_date = datetime.now(timezone.utc)
             start_date = end_date - timedelta(days=7)
             
-            # Simulate fetching and storing activity data
+            # Simulate fetching activity data; upserts are accumulated and
+            # sent as two bulk writes (one round-trip per collection)
+            # instead of one round-trip per day per collection
+            activity_ops = []
+            sleep_ops = []
             for i in range(7):
                 current_date = start_date + timedelta(days=i)
                 
@@ -118,12 +147,11 @@ class WearableService:
                     "is_complete": True
                 }
                 
-                # Upsert activity data
-                mongo.db.daily_activities.update_one(
+                activity_ops.append(UpdateOne(
                     {"user_id": str(user_id), "date": current_date},
                     {"$set": activity_data},
                     upsert=True
-                )
+                ))
                 
                 # Simulate sleep data
                 sleep_data = {
@@ -143,32 +171,36 @@ class WearableService:
                     "is_complete": True
                 }
                 
-                # Upsert sleep data
-                mongo.db.sleep_data.update_one(
+                sleep_ops.append(UpdateOne(
                     {"user_id": str(user_id), "date": current_date},
                     {"$set": sleep_data},
                     upsert=True
-                )
-            
+                ))
+
+            # Flush the accumulated upserts in bulk; unordered so the
+            # server can apply them in parallel
+            mongo.db.daily_activities.bulk_write(activity_ops, ordered=False)
+            mongo.db.sleep_data.bulk_write(sleep_ops, ordered=False)
+
             # Generate aggregated data
             WearableService.generate_aggregated_data(user_id, start_date, end_date)
             
             # Update last sync time
             mongo.db.wearable_connections.update_one(
                 {"user_id": str(user_id)},
-                {"$set": {"last_sync": datetime.utcnow()}}
+                {"$set": {"last_sync": datetime.now(timezone.utc)}}
             )
             
             # Update PostgreSQL user profile
             user_profile = UserProfile.query.filter_by(user_id=user_id).first()
             if user_profile:
-                user_profile.last_sync = datetime.utcnow()
+                user_profile.last_sync = datetime.now(timezone.utc)
                 db.session.commit()
             
             return True
             
         except Exception as e:
-            current_app.logger.error(f"Error syncing wearable data: {str(e)}")
+            current_app.logger.error("Error syncing wearable data: %s", e)
             return False
     
     @staticmethod
@@ -185,57 +217,81 @@ class WearableService:
             dict: Aggregated data
         """
         try:
-            # Fetch activity data
-            activity_data = list(mongo.db.daily_activities.find({
-                "user_id": str(user_id),
-                "date": {"$gte": start_date, "$lte": end_date}
-            }))
-            
-            # Fetch sleep data
-            sleep_data = list(mongo.db.sleep_data.find({
-                "user_id": str(user_id),
-                "date": {"$gte": start_date, "$lte": end_date}
-            }))
+            # Fetch activity data, projecting only the fields the
+            # aggregation below reads so full documents (hourly series,
+            # heart-rate zones, ...) never leave the server
+            activity_data = list(mongo.db.daily_activities.find(
+                {
+                    "user_id": str(user_id),
+                    "date": {"$gte": start_date, "$lte": end_date}
+                },
+                {
+                    "_id": 0,
+                    "steps": 1,
+                    "calories_burned": 1,
+                    "active_minutes.fairly_active": 1,
+                    "active_minutes.very_active": 1,
+                    "heart_rate.resting": 1,
+                }
+            ))
+
+            # Fetch sleep data with the same field pruning
+            sleep_data = list(mongo.db.sleep_data.find(
+                {
+                    "user_id": str(user_id),
+                    "date": {"$gte": start_date, "$lte": end_date}
+                },
+                {
+                    "_id": 0,
+                    "sleep_duration": 1,
+                    "sleep_stages.deep": 1,
+                    "efficiency": 1,
+                }
+            ))
             
             # Skip if no data
             if not activity_data or not sleep_data:
                 return None
                 
-            # Calculate averages
+            # Calculate averages in one pass per collection instead of one
+            # generator sweep per metric
             total_days = len(activity_data)
-            
+
             # Activity averages
-            avg_steps = sum(day["steps"] for day in activity_data) / total_days
-            avg_calories_burned = sum(day["calories_burned"] for day in activity_data) / total_days
-            avg_active_minutes = sum(
-                day["active_minutes"]["fairly_active"] + day["active_minutes"]["very_active"] 
-                for day in activity_data
-            ) / total_days
-            avg_resting_hr = sum(day["heart_rate"]["resting"] for day in activity_data) / total_days
-            
+            steps_sum = calories_sum = active_sum = resting_sum = 0
+            for day in activity_data:
+                steps_sum += day["steps"]
+                calories_sum += day["calories_burned"]
+                minutes = day["active_minutes"]
+                active_sum += minutes["fairly_active"] + minutes["very_active"]
+                resting_sum += day["heart_rate"]["resting"]
+            avg_steps = steps_sum / total_days
+            avg_calories_burned = calories_sum / total_days
+            avg_active_minutes = active_sum / total_days
+            avg_resting_hr = resting_sum / total_days
+
             # Sleep averages
-            avg_sleep_duration = sum(day["sleep_duration"] for day in sleep_data) / len(sleep_data)
-            avg_deep_sleep = sum(day["sleep_stages"]["deep"] for day in sleep_data) / len(sleep_data)
-            avg_sleep_efficiency = sum(day["efficiency"] for day in sleep_data) / len(sleep_data)
-            
-            # Determine activity level
-            activity_level = "sedentary"
-            if avg_steps >= 10000:
-                activity_level = "very_active"
-            elif avg_steps >= 7500:
-                activity_level = "moderately_active"
-            elif avg_steps >= 5000:
-                activity_level = "lightly_active"
+            sleep_days = len(sleep_data)
+            duration_sum = deep_sum = efficiency_sum = 0
+            for night in sleep_data:
+                duration_sum += night["sleep_duration"]
+                deep_sum += night["sleep_stages"]["deep"]
+                efficiency_sum += night["efficiency"]
+            avg_sleep_duration = duration_sum / sleep_days
+            avg_deep_sleep = deep_sum / sleep_days
+            avg_sleep_efficiency = efficiency_sum / sleep_days
+            
+            # Determine activity level by bucketing avg_steps
+            activity_level = _ACTIVITY_LEVELS[bisect_right(_STEP_THRESHOLDS, avg_steps)]
                 
-            # Determine sleep quality
-            # Determine sleep quality
+            # Determine sleep quality from the banded thresholds
             sleep_quality = "poor"
-            if avg_sleep_duration >= 8 and avg_deep_sleep >= 1.5 and avg_sleep_efficiency >= 90:
-                sleep_quality = "excellent"
-            elif avg_sleep_duration >= 7 and avg_deep_sleep >= 1.2 and avg_sleep_efficiency >= 85:
-                sleep_quality = "good"
-            elif avg_sleep_duration >= 6 and avg_deep_sleep >= 1.0 and avg_sleep_efficiency >= 80:
-                sleep_quality = "fair"
+            for min_duration, min_deep, min_efficiency, label in _SLEEP_QUALITY_BANDS:
+                if (avg_sleep_duration >= min_duration
+                        and avg_deep_sleep >= min_deep
+                        and avg_sleep_efficiency >= min_efficiency):
+                    sleep_quality = label
+                    break
             
             # Get user profile for BMR calculation
             user_profile = UserProfile.query.filter_by(user_id=user_id).first()
@@ -250,15 +306,8 @@ class WearableService:
                     bmr = 447.593 + (9.247 * user_profile.weight) + (3.098 * user_profile.height) - (4.330 * user_profile.age)
             
             # Adjust BMR based on activity level
-            activity_multipliers = {
-                "sedentary": 1.2,
-                "lightly_active": 1.375,
-                "moderately_active": 1.55,
-                "very_active": 1.725
-            }
-            
             estimated_bmr = int(bmr)
-            recommended_calories = int(bmr * activity_multipliers.get(activity_level, 1.2))
+            recommended_calories = int(bmr * _ACTIVITY_MULTIPLIERS.get(activity_level, 1.2))
             
             # Calculate recommended macros
             # Typical distribution: 30% protein, 40% carbs, 30% fat
@@ -289,7 +338,7 @@ class WearableService:
                     "carbs": recommended_carbs,
                     "fat": recommended_fat,
                 },
-                "generated_at": datetime.utcnow(),
+                "generated_at": datetime.now(timezone.utc),
                 "is_complete": True
             }
             
@@ -307,7 +356,7 @@ class WearableService:
             return aggregated_data
             
         except Exception as e:
-            current_app.logger.error(f"Error generating aggregated data: {str(e)}")
+            current_app.logger.error("Error generating aggregated data: %s", e)
             return None
     
     @staticmethod
@@ -328,7 +377,7 @@ class WearableService:
                 sort=[("generated_at", -1)]
             )
         except Exception as e:
-            current_app.logger.error(f"Error getting aggregated data: {str(e)}")
+            current_app.logger.error("Error getting aggregated data: %s", e)
             return None
     
     @staticmethod
@@ -359,5 +408,5 @@ class WearableService:
             return True
             
         except Exception as e:
-            current_app.logger.error(f"Error disconnecting device: {str(e)}")
+            current_app.logger.error("Error disconnecting device: %s", e)
             return False
\ No newline at end of file
@@ -1,7 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 
+def _utcnow():
+    """Timezone-aware UTC timestamp for column defaults."""
+    return datetime.now(timezone.utc)
+
 # Association tables
 meal_plan_meals = db.Table('meal_plan_meals',
     db.Column('meal_plan_id', db.Integer, db.ForeignKey('meal_plans.id'), primary_key=True),
@@ -29,7 +33,7 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     # One-to-one relationship with profile
     profile = db.relationship('UserProfile', backref='user', uselist=False)
@@ -75,7 +79,7 @@ class UserProfile(db.Model):
     wearable_connected = db.Column(db.Boolean, default=False)
     wearable_type = db.Column(db.String(50))  # fitbit, apple_watch, etc.
     wearable_id = db.Column(db.String(100))   # ID or token for the connected device
-    last_sync = db.Column(db.DateTime)
+    last_sync = db.Column(db.DateTime(timezone=True))
     
     # Many-to-many relationship with dietary restrictions
     dietary_restrictions = db.relationship('DietaryRestriction', 
@@ -95,7 +99,7 @@ class MealPlan(db.Model):
     name = db.Column(db.String(100), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     total_calories = db.Column(db.Integer)
     total_protein = db.Column(db.Float)